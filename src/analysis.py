@@ -0,0 +1,66 @@
+"""
+ai_reader.analysis
+==================
+One-stop paragraph analysis: entities, mood and main action computed together
+so that prompt builders never run the same model twice on the same text.
+
+Public API
+----------
+* ``analyze(text)`` – ``{"ents": [...], "mood": str, "action": str | None}``,
+  memoised on *text*.
+* ``analyze_many(texts)`` – same schema, one dict per input, with the NER and
+  emotion models fed in batches.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+if __package__:  # imported as part of the package (e.g. from the tests)
+    from .extraction import extract_action, extract_actions, perform_ner, perform_ner_stream
+    from .mood import detect_mood, detect_mood_stream
+else:  # run as a script from inside src/
+    from extraction import extract_action, extract_actions, perform_ner, perform_ner_stream
+    from mood import detect_mood, detect_mood_stream
+
+# -----------------------------------------------------------------------------
+# Constants
+# -----------------------------------------------------------------------------
+
+BATCH_SIZE = 16  # passages per forward pass in ``analyze_many``
+
+# -----------------------------------------------------------------------------
+# Public API
+# -----------------------------------------------------------------------------
+
+def analyze(text: str) -> Dict[str, object]:
+    """Run NER, mood detection and action extraction once for *text*."""
+    ents, mood, action = _analyze_cached(text)
+    return {"ents": [dict(ent) for ent in ents], "mood": mood, "action": action}
+
+
+@lru_cache(maxsize=1024)
+def _analyze_cached(text: str) -> Tuple[Tuple[Dict[str, str], ...], str, str | None]:
+    """Memoised analysis stored in immutable form.
+
+    The tuple is shared by every caller; :func:`analyze` wraps it in a fresh
+    dict with copied entity dicts so callers may mutate what they receive.
+    """
+    return tuple(perform_ner(text)), detect_mood(text)[0]["mood"], extract_action(text)
+
+
+def analyze_many(texts: List[str]) -> List[Dict[str, object]]:
+    """Batched :func:`analyze` – list in, list out (same order)."""
+    texts = list(texts)
+    if not texts:
+        return []
+
+    ents = perform_ner_stream(texts, batch_size=BATCH_SIZE)
+    moods = detect_mood_stream(texts, batch_size=BATCH_SIZE)
+    actions = extract_actions(texts)
+
+    return [
+        {"ents": e, "mood": m[0]["mood"], "action": a}
+        for e, m, a in zip(ents, moods, actions)
+    ]
@@ -8,7 +8,9 @@ character / place / object extraction.
 Exports
 =======
 * ``perform_ner(text)`` → list of {text, type, score}
+* ``perform_ner_stream(texts)`` → lazily yields ``perform_ner`` results for many passages
 * ``extract_action(text)`` → subject‑verb phrase (e.g. "Hermione running toward") or ``None``
+* ``extract_actions(texts)`` → batched ``extract_action`` over many passages
 
 The action extractor wraps the Hugging Face model
 `akbik/openie-coreference-resolved`, which returns coreference‑resolved SPO
@@ -16,21 +18,23 @@ triples. We keep the *subject + relation* portion to capture who is doing what.
 """
 from __future__ import annotations
 
-import re
+import logging
 from functools import lru_cache
-from typing import Dict, List, Tuple
-import spacy
-from transformers import pipeline
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Tuple
 
+import torch
+from spacy.matcher import Matcher
 
-@lru_cache(maxsize=1)
-def _ner_pipeline():
-    """Load + cache the NER pipeline so weights are fetched only once."""
-    return pipeline(
-        task="ner",  # instructs the pipeline what to do
-        model="dslim/bert-base-NER",  # lightweight BERT fine‑tuned for NER
-        aggregation_strategy="simple",  # merge sub‑tokens into whole words
-    )
+if __package__:  # imported as part of the package (e.g. from the tests)
+    from .models import ner_pipeline, spacy_nlp
+else:  # run as a script from inside src/
+    from models import ner_pipeline, spacy_nlp
+
+logger = logging.getLogger(__name__)
+
+# (word, entity_group, score) from one raw pipeline entity, in a single C call
+_ENTITY_FIELDS = itemgetter("word", "entity_group", "score")
 
 
 def perform_ner(text: str) -> List[Dict[str, str]]:
@@ -39,71 +43,70 @@ def perform_ner(text: str) -> List[Dict[str, str]]:
     Parameters
     ----------
     text : str
-        The passage to analyse.
+        The passage to analyse.  Only the first 256 tokens (``MAX_TOKENS``) are
+        seen by the model; entities beyond that are silently dropped, so split
+        long text into paragraphs first.
 
     Returns
     -------
     List[Dict[str, str]]
         Each dict has `text`, `type` (PER/LOC/ORG/MISC) and `score`.
     """
-    raw = _ner_pipeline()(text)
-    print("RAW OUTPUT:", raw)
-    # Reshape the pipeline output into a clean, predictable schema
-    simplified = [
-        {
-            "word": ent["word"],
-            "entity": ent["entity_group"],
-            "score": float(ent["score"]),
-        }
-        for ent in raw
-    ]
-    # Reconstruct entities from subwords
-    return reconstruct_entities(simplified)
+    return [dict(ent) for ent in _perform_ner_cached(text)]
 
-def reconstruct_entities(ents: List[Dict[str, str]]) -> List[Dict[str, str]]:
-    """Reconstruct entities by merging subwords into full words.
 
-    Parameters
-    ----------
-    ents : List[Dict[str, str]]
-        List of token-level entities.
+@lru_cache(maxsize=256)
+@torch.inference_mode()
+def _perform_ner_cached(text: str) -> Tuple[Dict[str, str], ...]:
+    """Memoised NER forward pass – identical passages reuse the result.
 
-    Returns
-    -------
-    List[Dict[str, str]]
-        List of reconstructed entities with `text`, `type`, and `score`.
+    Stored as a tuple shared by every caller; :func:`perform_ner` hands out
+    copies of the dicts so callers may mutate what they receive.
     """
-    reconstructed = []
-    current_entity = None
-
-    for e in ents:
-
-        if e["word"].startswith("##"):
-            # Append subword to the current entity
-            current_entity["text"] += e["word"][2:]
-            current_entity["score"] = min(current_entity["score"], e["score"])  # Use the lowest score
-        else:
-            
-            # Start a new entity
-            if current_entity:
-                reconstructed.append(current_entity)
-            current_entity = {"text": e["word"], "type": e["entity"], "score": e["score"]}
-
-    # Add the last entity
-    if current_entity:
-        reconstructed.append(current_entity)
-
-    return reconstructed
+    raw = ner_pipeline()(text)
+    logger.debug("raw ner: %r", raw)
+    return tuple(_to_entities(raw))
+
+
+@torch.inference_mode()
+def perform_ner_stream(texts: Iterable[str], *, batch_size: int = 16) -> Iterator[List[Dict[str, str]]]:
+    """Yield :func:`perform_ner` results for *texts* (e.g. a book's paragraphs).
+
+    *texts* is fed to the pipeline as a generator so its internal DataLoader
+    overlaps tokenisation, batched forward passes and post‑processing.  As with
+    :func:`perform_ner`, each passage is truncated to its first 256 tokens
+    (``MAX_TOKENS``) – pass paragraphs, not whole chapters.
+    """
+    for raw in ner_pipeline()((t for t in texts), batch_size=batch_size):
+        yield _to_entities(raw)
+
+
+def _to_entities(raw: List[dict]) -> List[Dict[str, str]]:
+    """Convert raw pipeline output for one passage into the public schema.
+
+    The pipeline already groups sub‑tokens into whole words, so this is a
+    straight reshape.
+    """
+    return [
+        {"text": word, "type": group, "score": float(score)}
+        for word, group, score in map(_ENTITY_FIELDS, raw)
+    ]
+
+
 # -----------------------------------------------------------------------------
 # Action extraction via spaCy
 # -----------------------------------------------------------------------------
 
-@lru_cache(maxsize=1)
-def _nlp():
-    """Load spaCy English model once (13 MB)."""
-    return spacy.load("en_core_web_sm")
+# Only the first sentence is used, so parse a bounded prefix of the passage
+_ACTION_SPAN = 200
+
 
-_AUX = re.compile(r"\b(?:is|are|was|were|be|been|being)\s+", re.I)
+@lru_cache(maxsize=1)
+def _root_verb_matcher() -> Matcher:
+    """Compile the ROOT‑verb token pattern once against the shared vocab."""
+    matcher = Matcher(spacy_nlp().vocab)
+    matcher.add("ROOT_VERB", [[{"DEP": "ROOT", "POS": "VERB"}]])
+    return matcher
 
 
 def extract_action(text: str) -> str | None:
@@ -112,16 +115,32 @@ def extract_action(text: str) -> str | None:
     >>> extract_action("Harry and Hermione are running toward the station")
     'run'
     """
-    doc = _nlp()(text)
-    if not doc.sents:
+    return _extract_action_cached(text[:_ACTION_SPAN])
+
+
+@lru_cache(maxsize=256)
+def _extract_action_cached(span: str) -> str | None:
+    """Memoised parse of the (already truncated) passage prefix."""
+    return _root_lemma(spacy_nlp()(span))
+
+
+def extract_actions(texts: Iterable[str]) -> List[str | None]:
+    """Batched :func:`extract_action` – streams *texts* through ``nlp.pipe``."""
+    docs = spacy_nlp().pipe((t[:_ACTION_SPAN] for t in texts), batch_size=64)
+    return [_root_lemma(doc) for doc in docs]
+
+
+def _root_lemma(doc) -> str | None:
+    """Lowercase lemma of the first sentence's ROOT verb in *doc*, if any."""
+    if not len(doc):
         return None
 
-    sent = next(doc.sents)  # first sentence only
-    root = next((t for t in sent if t.dep_ == "ROOT" and t.pos_.startswith("V")), None)
-    if root is None:
+    sent = doc[0].sent  # first sentence only
+    matches = _root_verb_matcher()(sent, as_spans=True)
+    if not matches:
         return None
 
-    return root.lemma_.lower()
+    return matches[0][0].lemma_.lower()
 
 
 # -----------------------------------------------------------------------------
@@ -131,8 +150,9 @@ def extract_action(text: str) -> str | None:
 
 if __name__ == "__main__":
     _sample = "Harry and Hermione are running toward the station to catch the train."
-    for e in perform_ner(_sample):
+    _ents = perform_ner(_sample)
+    for e in _ents:
         print(f"{e['text']:<10} {e['type']:<4} {e['score']:.3f}")
 
-    print("NER:", perform_ner(_sample))
+    print("NER:", _ents)
     print("ACTION:", extract_action(_sample))
@@ -0,0 +1,225 @@
+"""
+ai_reader.models
+================
+Single home for every model the reader uses, shared by the extraction, mood
+and analysis modules so each is loaded at most once per process.
+
+Public API
+----------
+* ``ner_pipeline()`` – cached token‑classification pipeline.
+* ``mood_pipeline()`` – cached emotion‑classification pipeline.
+* ``spacy_nlp()`` – cached spaCy English pipeline for action extraction.
+* ``warmup()`` – load all of the above in parallel at process start.
+* ``load_pipeline(task, model_id, **kwargs)`` – Hugging Face pipeline backed by
+  a transformer‑fused (attention, LayerNorm, GELU), dynamically INT8‑quantised
+  ONNX Runtime export of *model_id*.
+
+The ONNX export + fusion + quantisation runs once; the artefact is cached under
+``$AI_READER_CACHE`` (default ``~/.cache/ai_reader``) and reused afterwards.  It
+is built in a temporary sibling directory and renamed into place, so a crashed
+or concurrent first run never leaves a half‑written model behind.
+When ``optimum[onnxruntime]`` is not installed the plain FP32 PyTorch pipeline
+is returned instead.
+
+Device selection: ``$AI_READER_DEVICE`` (e.g. ``cuda:1``, ``mps``, ``cpu``) wins;
+otherwise the first CUDA GPU is used when present.  On an accelerator the
+PyTorch model runs there directly – INT8 ONNX is a CPU‑only optimisation.
+CPU inference uses ``$AI_READER_THREADS`` intra‑op threads (default: half the
+logical cores) for both PyTorch and ONNX Runtime.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from pathlib import Path
+
+import spacy
+import torch
+from transformers import AutoTokenizer, pipeline
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------------------------------------------------------
+# Constants
+# -----------------------------------------------------------------------------
+
+# Inputs are truncated to this many tokens: bounds the O(n²) attention cost
+MAX_TOKENS = 256
+
+CACHE_DIR = Path(os.environ.get("AI_READER_CACHE", Path.home() / ".cache" / "ai_reader"))
+
+# Intra‑op threads for BERT GEMMs; default to physical cores (≈ logical / 2)
+# to avoid oversubscribing hyper‑threads and thrashing the shared L3.
+NUM_THREADS = int(os.environ.get("AI_READER_THREADS", max(1, (os.cpu_count() or 2) // 2)))
+
+DEVICE = os.environ.get("AI_READER_DEVICE") or ("cuda:0" if torch.cuda.is_available() else "cpu")
+
+# The torch ONNX exporter keeps process‑global state: one export at a time per
+# process.  Across processes the atomic rename in ``load_pipeline`` keeps the
+# on‑disk cache consistent.
+_EXPORT_LOCK = threading.Lock()
+
+_OPTIMIZED_FILE = "model_optimized.onnx"
+_QUANTIZED_FILE = "model_optimized_quantized.onnx"
+
+# pipeline task -> optimum.onnxruntime model class
+_ORT_MODELS = {
+    "ner": "ORTModelForTokenClassification",
+    "text-classification": "ORTModelForSequenceClassification",
+}
+
+torch.set_num_threads(NUM_THREADS)
+try:
+    torch.set_num_interop_threads(1)
+except RuntimeError:  # host process already ran parallel torch work
+    pass
+
+# -----------------------------------------------------------------------------
+# Internal helpers
+# -----------------------------------------------------------------------------
+
+def _load_once(loader):
+    """Cache a no‑argument *loader* like ``lru_cache(maxsize=1)``, but make
+    concurrent first calls (e.g. a request racing :func:`warmup`) wait for the
+    one in‑flight load instead of loading the model again."""
+    lock = threading.Lock()
+    loaded = []
+
+    @wraps(loader)
+    def wrapper():
+        if not loaded:
+            with lock:
+                if not loaded:
+                    loaded.append(loader())
+        return loaded[0]
+
+    return wrapper
+
+
+@lru_cache(maxsize=None)
+def _tokenizer(model_id: str):
+    """Fast (Rust ``tokenizers``) tokenizer for *model_id*, loaded once per model."""
+    return AutoTokenizer.from_pretrained(model_id, use_fast=True, model_max_length=MAX_TOKENS)
+
+# -----------------------------------------------------------------------------
+# Public API
+# -----------------------------------------------------------------------------
+
+def load_pipeline(task: str, model_id: str, **kwargs):
+    """Return a *task* pipeline for *model_id* on :data:`DEVICE`, INT8‑quantised on CPU.
+
+    Extra keyword arguments (``aggregation_strategy``, ``top_k`` …) are passed
+    through to the pipeline unchanged.  The tokenizer is capped at
+    :data:`MAX_TOKENS`, so truncating pipelines never exceed that length.
+    """
+    tokenizer = _tokenizer(model_id)
+    if DEVICE != "cpu":
+        return pipeline(task=task, model=model_id, tokenizer=tokenizer, device=DEVICE, **kwargs)
+
+    try:
+        import onnxruntime
+        import optimum.onnxruntime as ort
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig, OptimizationConfig
+        from optimum.pipelines import pipeline as ort_pipeline
+    except ImportError as exc:
+        logger.warning(
+            "%s: optimum[onnxruntime] unavailable (%s); using FP32 PyTorch pipeline", model_id, exc
+        )
+        return pipeline(task=task, model=model_id, tokenizer=tokenizer, **kwargs)
+
+    model_cls = getattr(ort, _ORT_MODELS[task])
+    save_dir = CACHE_DIR / f"{model_id.replace('/', '--')}-opt-int8"
+    with _EXPORT_LOCK:
+        if not (save_dir / _QUANTIZED_FILE).exists():
+            # First run only: export to ONNX, fuse transformer subgraphs (attention,
+            # LayerNorm, GELU) offline, then dynamic INT8 quantisation of the fused
+            # graph – all in a private temp dir that is renamed into place when done
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_dir = Path(tempfile.mkdtemp(dir=CACHE_DIR))
+            try:
+                exported = model_cls.from_pretrained(model_id, export=True)
+                ort.ORTOptimizer.from_pretrained(exported).optimize(
+                    save_dir=tmp_dir,
+                    optimization_config=OptimizationConfig(optimization_level=2),
+                )
+                quantizer = ort.ORTQuantizer.from_pretrained(tmp_dir, file_name=_OPTIMIZED_FILE)
+                quantizer.quantize(
+                    save_dir=tmp_dir,
+                    quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False),
+                )
+                exported.config.save_pretrained(tmp_dir)
+                try:
+                    os.replace(tmp_dir, save_dir)
+                except OSError:
+                    if not (save_dir / _QUANTIZED_FILE).exists():
+                        raise
+                    # Another process finished first: keep its complete artefact
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    session_options = onnxruntime.SessionOptions()
+    session_options.intra_op_num_threads = NUM_THREADS
+
+    model = model_cls.from_pretrained(
+        save_dir,
+        file_name=_QUANTIZED_FILE,
+        provider="CPUExecutionProvider",
+        session_options=session_options,
+    )
+    return ort_pipeline(task, model=model, tokenizer=tokenizer, accelerator="ort", **kwargs)
+
+
+# -----------------------------------------------------------------------------
+# Shared pipelines
+# -----------------------------------------------------------------------------
+
+@_load_once
+def ner_pipeline():
+    """Load + cache the (INT8‑quantised) NER pipeline so weights are fetched only once."""
+    return load_pipeline(
+        task="ner",  # instructs the pipeline what to do
+        model_id="dslim/distilbert-NER",  # 6‑layer DistilBERT fine‑tuned for NER
+        aggregation_strategy="first",  # group sub‑tokens into whole words, no "##" leftovers
+    )
+
+
+@_load_once
+def mood_pipeline():
+    """Load + cache an emotion‑classification pipeline (≈120 MB FP32), INT8‑quantised when possible."""
+    return load_pipeline(
+        task="text-classification",
+        model_id="j-hartmann/emotion-english-distilroberta-base",
+        top_k=None,  # return full distribution per sample
+        truncation=True,  # cap input at the tokenizer's MAX_TOKENS
+    )
+
+
+@_load_once
+def spacy_nlp():
+    """Load spaCy English model once (13 MB), minus the unused NER component.
+
+    ``tagger``/``attribute_ruler`` stay enabled: they supply ``pos_`` and feed
+    the rule‑based lemmatizer.
+    """
+    return spacy.load("en_core_web_sm", disable=["ner"])
+
+
+def warmup() -> None:
+    """Load every shared model concurrently so the first request pays no load cost.
+
+    Model loading is mostly disk I/O and C‑extension init that releases the
+    GIL, so the three loads overlap instead of running back to back.  Within this
+    process, first‑run ONNX exports still happen one at a time (``_EXPORT_LOCK``
+    covers threads only; other processes are kept safe by the atomic cache
+    rename in :func:`load_pipeline`), and callers arriving mid‑warmup wait for
+    the in‑flight load rather than starting another.
+    """
+    loaders = [ner_pipeline, mood_pipeline, spacy_nlp]
+    with ThreadPoolExecutor(len(loaders)) as ex:
+        list(ex.map(lambda load: load(), loaders))
@@ -8,6 +8,8 @@ Exported helpers
 * ``detect_mood(text, k=1, threshold=0.0)`` – returns the *k* most probable
   emotions above *threshold* (probability).  Default ``k=1`` & ``threshold=0``
   reproduces the old behaviour of a single best‑guess label.
+* ``detect_mood_stream(texts, k=1, threshold=0.0)`` – lazily yields the same
+  result for each of many passages, batching the model calls.
 
 Returned schema
 ---------------
@@ -22,23 +24,15 @@ Returned schema
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
 
-from transformers import pipeline
-
-# --------------------------
-# model + pipeline handling
-# --------------------------
-
-@lru_cache(maxsize=1)
-def _sentiment_pipeline():
-    """Load + cache an emotion‑classification pipeline (≈120 MB)."""
-    return pipeline(
-        task="text-classification",
-        model="j-hartmann/emotion-english-distilroberta-base",
-        top_k=None,  # return full distribution per sample
-    )
+import numpy as np
+import torch
 
+if __package__:  # imported as part of the package (e.g. from the tests)
+    from .models import mood_pipeline
+else:  # run as a script from inside src/
+    from models import mood_pipeline
 
 # --------------------------
 # public API
@@ -50,7 +44,7 @@ def detect_mood(text: str, *, k: int = 1, threshold: float = 0.0) -> List[Dict[s
     Parameters
     ----------
     text : str
-        Passage to analyse (first 512 chars considered).
+        Passage to analyse (the model sees at most the first 256 tokens).
     k : int, optional
         Number of top labels to keep (after thresholding).  ``k <= 0`` means
         *all* labels above ``threshold``.
@@ -64,26 +58,59 @@ def detect_mood(text: str, *, k: int = 1, threshold: float = 0.0) -> List[Dict[s
      {'mood': 'love', 'confidence': 0.012},
      {'mood': 'surprise', 'confidence': 0.010}]
     """
+    return _rank_moods(_mood_distribution(text), k=k, threshold=threshold)
+
+
+@lru_cache(maxsize=256)
+@torch.inference_mode()
+def _mood_distribution(text: str) -> Tuple[Dict[str, float], ...]:
+    """Memoised forward pass keyed on *text* only, shared by every ``k``/``threshold``.
+
+    Stored as a tuple shared by every caller; it is only read by
+    :func:`_rank_moods`, which builds fresh dicts for the caller.
+    """
     # 1. Run the model (cached) – returns [[{label, score}, …]]
-    preds = _sentiment_pipeline()(text[:512])[0]
+    return tuple(mood_pipeline()(text)[0])
+
+
+@torch.inference_mode()
+def detect_mood_stream(
+    texts: Iterable[str],
+    *,
+    k: int = 1,
+    threshold: float = 0.0,
+    batch_size: int = 16,
+) -> Iterator[List[Dict[str, float]]]:
+    """Yield :func:`detect_mood` results for *texts*, batching forward passes.
+
+    *texts* is fed to the pipeline as a generator so its internal DataLoader
+    streams batches instead of running one forward pass per passage.
+    """
+    for preds in mood_pipeline()((t for t in texts), batch_size=batch_size):
+        yield _rank_moods(preds, k=k, threshold=threshold)
+
+
+def _rank_moods(preds: Sequence[dict], *, k: int, threshold: float) -> List[Dict[str, float]]:
+    """Threshold, sort and trim the label distribution for one passage."""
+    scores = np.fromiter((p["score"] for p in preds), dtype=np.float64, count=len(preds))
 
     # 2. Filter by threshold
-    filtered = [p for p in preds if p["score"] >= threshold]
+    idx = np.flatnonzero(scores >= threshold)
 
-    # 3. Sort descending by probability
-    filtered.sort(key=lambda p: p["score"], reverse=True)
+    # 3. Sort descending by probability (stable, so ties keep model order)
+    idx = idx[np.argsort(-scores[idx], kind="stable")]
 
     # 4. Trim to k labels unless k <= 0 (meaning no limit)
     if k > 0:
-        filtered = filtered[:k]
+        idx = idx[:k]
 
     # 5. Normalise output schema
     return [
         {
-            "mood": p["label"].lower(),
-            "confidence": round(float(p["score"]), 3),
+            "mood": preds[i]["label"].lower(),
+            "confidence": round(float(scores[i]), 3),
         }
-        for p in filtered
+        for i in idx
     ]
 
 
@@ -6,16 +6,23 @@ leveraging extracted entities and detected mood.
 
 Public API
 ----------
+* ``build_prompts(text, style=None)`` – both prompts below from one analysis pass.
 * ``build_image_prompt(text, style=None)`` – concise Stable Diffusion / DALLE‑3 prompt.
 * ``build_audio_prompt(text)`` – mood‑mapped descriptor string for a 20‑30 s loop.
 """
 
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
-from extraction import perform_ner, extract_action
-from mood import detect_mood
+if __package__:  # imported as part of the package (e.g. from the tests)
+    from .analysis import analyze
+    from .models import warmup
+    from .mood import detect_mood
+else:  # run as a script from inside src/
+    from analysis import analyze
+    from models import warmup
+    from mood import detect_mood
 
 # -----------------------------------------------------------------------------
 # Constants
@@ -40,35 +47,23 @@ MOOD_AUDIO_MAP = {
 
 def _partition_entities(entities: List[dict]) -> Tuple[List[str], List[str]]:
     """Return (people, locations) lists from entity dicts."""
-    people, places = [], []
+    buckets = {"PER": [], "LOC": []}
     for ent in entities:
-        if ent["type"] == "PER":
-            people.append(ent["text"])
-        elif ent["type"] == "LOC":
-            places.append(ent["text"])
-    return people, places
+        bucket = buckets.get(ent["type"])  # one lookup per entity
+        if bucket is not None:
+            bucket.append(ent["text"])
+    return buckets["PER"], buckets["LOC"]
 
-# -----------------------------------------------------------------------------
-# Public builders
-# -----------------------------------------------------------------------------
 
-def build_image_prompt(
+def _format_image_prompt(
     text: str,
-    *,
-    style: str | None = None,
-    include_context: bool = False,
+    analysis: Dict[str, object],
+    style: str | None,
+    include_context: bool,
 ) -> str:
-    """Return a prompt string for Stable Diffusion / GPT‑Image‑1.
-
-    * Extracts entities (PER, LOC)
-    * Extracts main action phrase
-    * Adds mood tag and default style block
-    * Optionally prepends a CONTEXT section for GPT‑Image‑1
-    """
-    ents = perform_ner(text)
-    mood = detect_mood(text)[0]["mood"]
-    action = extract_action(text)
-    people, places = _partition_entities(ents)
+    """Assemble the image prompt from an ``analyze`` result."""
+    people, places = _partition_entities(analysis["ents"])
+    action = analysis["action"]
 
     parts: List[str] = []
     parts.extend(people or ["a figure"])
@@ -76,7 +71,7 @@ def build_image_prompt(
         parts.append(action)
     if places:
         parts.append("in " + ", ".join(places))
-    parts.append(f"mood: {mood}")
+    parts.append(f"mood: {analysis['mood']}")
     parts.append(_DEF_IMG_STYLE)
     if style:
         parts.append(style)
@@ -90,17 +85,61 @@ def build_image_prompt(
     return f"### CONTEXT\n{context}\n\n### IMAGE INSTRUCTIONS\n{instructions}"
 
 
-def build_audio_prompt(text: str) -> str:
-    """Return a one‑line descriptor for an ambient loop based on mood."""
-    mood = detect_mood(text)[0]["mood"]
+def _format_audio_prompt(mood: str) -> str:
+    """Map *mood* to an ambient‑loop descriptor."""
     desc = MOOD_AUDIO_MAP.get(mood, "ambient soundscape")
     return f"{desc} loop"
 
+# -----------------------------------------------------------------------------
+# Public builders
+# -----------------------------------------------------------------------------
+
+def build_prompts(
+    text: str,
+    *,
+    style: str | None = None,
+    include_context: bool = False,
+) -> Dict[str, str]:
+    """Return ``{"image": ..., "audio": ...}`` from a single analysis of *text*.
+
+    Prefer this over calling both single‑prompt builders: NER, mood and action
+    are computed once and shared by the two prompts.
+    """
+    analysis = analyze(text)
+    return {
+        "image": _format_image_prompt(text, analysis, style, include_context),
+        "audio": _format_audio_prompt(analysis["mood"]),
+    }
+
+
+def build_image_prompt(
+    text: str,
+    *,
+    style: str | None = None,
+    include_context: bool = False,
+) -> str:
+    """Return a prompt string for Stable Diffusion / GPT‑Image‑1.
+
+    * Extracts entities (PER, LOC)
+    * Extracts main action phrase
+    * Adds mood tag and default style block
+    * Optionally prepends a CONTEXT section for GPT‑Image‑1
+    """
+    return _format_image_prompt(text, analyze(text), style, include_context)
+
+
+def build_audio_prompt(text: str) -> str:
+    """Return a one‑line descriptor for an ambient loop based on mood."""
+    # Mood only: detect_mood's cache is shared with analyze(), no NER/spaCy pass
+    return _format_audio_prompt(detect_mood(text)[0]["mood"])
+
 # -----------------------------------------------------------------------------
 # CLI demo
 # -----------------------------------------------------------------------------
 
 if __name__ == "__main__":
+    warmup()
     sample = "Breathing hard, Harry and Ron sprinted across the rain-slick platform toward the scarlet Hogwarts Express as its whistle shrieked, sparks cascading from the engine’s smokestack."
-    print("IMAGE PROMPT:\n", build_image_prompt(sample, include_context=False))
-    print("\nAUDIO PROMPT:\n", build_audio_prompt(sample))
\ No newline at end of file
+    prompts = build_prompts(sample, include_context=False)
+    print("IMAGE PROMPT:\n", prompts["image"])
+    print("\nAUDIO PROMPT:\n", prompts["audio"])
@@ -0,0 +1,31 @@
+import pytest
+
+
+def _without_scores(value):
+    """Drop ``score``/``confidence`` fields recursively.
+
+    Padding inside a batch can nudge model scores in the last decimals, so
+    batched vs. single-call results are compared on labels only.
+    """
+    if isinstance(value, dict):
+        return {k: _without_scores(v) for k, v in value.items() if k not in {"score", "confidence"}}
+    if isinstance(value, (list, tuple)):
+        return [_without_scores(v) for v in value]
+    return value
+
+
+@pytest.fixture
+def without_scores():
+    return _without_scores
+
+
+@pytest.fixture
+def passages():
+    """More passages than the ``batch_size=2`` used in the stream tests."""
+    return [
+        "Alice visited Paris.",
+        "Harry and Hermione walked to Hogwarts.",
+        "I love sunny days and cheerful company.",
+        "The storm left everyone in London terrified.",
+        "Ron smiled as the train left King's Cross.",
+    ]
@@ -0,0 +1,24 @@
+from ai_reader.src.analysis import analyze, analyze_many
+from ai_reader.src.prompt import build_audio_prompt, build_image_prompt, build_prompts
+
+
+def test_analyze_many_matches_single_calls(passages, without_scores):
+    assert without_scores(analyze_many(passages)) == without_scores([analyze(t) for t in passages])
+
+
+def test_analyze_result_is_safe_to_mutate():
+    text = "Harry and Hermione walked to Hogwarts."
+    first = analyze(text)
+    first["ents"].clear()
+    first["mood"] = "mutated"
+    second = analyze(text)
+    assert second["ents"] and second["mood"] != "mutated"
+
+
+def test_build_prompts_matches_single_builders():
+    text = "Harry and Ron sprinted across the platform toward the train."
+    prompts = build_prompts(text, style="watercolour")
+    assert prompts == {
+        "image": build_image_prompt(text, style="watercolour"),
+        "audio": build_audio_prompt(text),
+    }
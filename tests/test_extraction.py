@@ -1,5 +1,5 @@
 import pytest
-from ai_reader.src.extraction import perform_ner
+from ai_reader.src.extraction import extract_action, extract_actions, perform_ner, perform_ner_stream
 
 
 def test_perform_ner_returns_list_of_dicts():
@@ -19,4 +19,19 @@ def test_perform_ner_detects_known_names():
     text = "Harry and Hermione walked to Hogwarts."
     ents = perform_ner(text)
     names = {e["text"] for e in ents if e["type"] == "PER"}
-    assert {"Harry", "Hermione"}.issubset(names)
\ No newline at end of file
+    assert {"Harry", "Hermione"}.issubset(names)
+
+
+def test_extract_actions_matches_single_calls():
+    texts = [
+        "Harry and Hermione are running toward the station.",
+        "The owl delivered a letter.",
+        "",
+    ]
+    assert extract_actions(texts) == [extract_action(t) for t in texts]
+
+
+def test_perform_ner_stream_matches_single_calls(passages, without_scores):
+    # A generator spanning several batches checks streaming and cross-batch order
+    streamed = list(perform_ner_stream((t for t in passages), batch_size=2))
+    assert without_scores(streamed) == without_scores([perform_ner(t) for t in passages])
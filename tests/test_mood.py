@@ -1,4 +1,11 @@
-from ai_reader.src.mood import detect_mood
+from ai_reader.src.mood import _rank_moods, detect_mood, detect_mood_stream
+
+_PREDS = [
+    {"label": "Joy", "score": 0.5},
+    {"label": "Fear", "score": 0.2},
+    {"label": "Love", "score": 0.2},
+    {"label": "Anger", "score": 0.1},
+]
 
 
 def test_detect_mood_schema():
@@ -23,4 +30,28 @@ def test_detect_mood_threshold_and_k():
     high = detect_mood(text, k=0, threshold=0.9)
     for item in high:
         # print(item)
-        assert item["confidence"] >= 0.9
\ No newline at end of file
+        assert item["confidence"] >= 0.9
+
+
+def test_detect_mood_stream_matches_single_calls(passages, without_scores):
+    # A generator spanning several batches checks streaming and cross-batch order
+    streamed = list(detect_mood_stream((t for t in passages), k=2, batch_size=2))
+    assert without_scores(streamed) == without_scores([detect_mood(t, k=2) for t in passages])
+
+
+def test_rank_moods_orders_descending_and_keeps_ties_stable():
+    ranked = _rank_moods(_PREDS, k=0, threshold=0.0)
+    assert [m["mood"] for m in ranked] == ["joy", "fear", "love", "anger"]
+    assert ranked[0] == {"mood": "joy", "confidence": 0.5}
+
+
+def test_rank_moods_k_limits():
+    assert [m["mood"] for m in _rank_moods(_PREDS, k=2, threshold=0.0)] == ["joy", "fear"]
+    # k larger than the label set returns everything; k <= 0 means no limit
+    assert len(_rank_moods(_PREDS, k=10, threshold=0.0)) == len(_PREDS)
+    assert len(_rank_moods(_PREDS, k=-1, threshold=0.0)) == len(_PREDS)
+
+
+def test_rank_moods_threshold_filters():
+    assert [m["mood"] for m in _rank_moods(_PREDS, k=0, threshold=0.2)] == ["joy", "fear", "love"]
+    assert _rank_moods(_PREDS, k=3, threshold=0.9) == []